@@ -0,0 +1,87 @@
+"""
+Startup-time benchmark for cli.py
+
+Runs short CLI invocations in fresh interpreters with `-X importtime` and
+reports the wall time, the import time and which heavy modules were loaded.
+`--help` should not load pandas, requests or the API client, and `process`
+should only load pandas, without the API key being set.
+
+Usage:
+------
+    $ python benchmarks/cli_startup.py
+    $ python benchmarks/cli_startup.py --repeat 10
+"""
+
+from statistics import median
+from typing import Dict, List, Set
+from pathlib import Path
+import subprocess
+import tempfile
+import argparse
+import time
+import sys
+import os
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "cli.py"
+HEAVY_MODULES = ["pandas", "requests", "flight.api", "flight.tidy"]
+
+
+def run(args: List[str]) -> Dict[str, float]:
+    """
+    Run the CLI once and parse the `-X importtime` report.
+
+    Args:
+        args: Arguments passed to cli.py
+
+    Returns:
+        Dictionary with the wall time, the import time (seconds) and the
+        top-level modules imported
+    """
+    env = {k: v for k, v in os.environ.items() if k != "API_KEY_FLIGHTS"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI), *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"cli.py {' '.join(args)} failed:\n{result.stderr[-2000:]}")
+
+    imports = 0
+    modules: Set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports are not indented, nested ones are
+        if not name.startswith("  "):
+            imports += int(cumulative)
+        modules.add(name.strip())
+    return {"wall": wall, "imports": imports / 1e6, "modules": modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command")
+    repeat = parser.parse_args().repeat
+
+    with tempfile.TemporaryDirectory() as tmp:
+        commands = {
+            "--help": ["--help"],
+            "process": ["process", tmp, os.path.join(tmp, "raw.csv")],
+        }
+        print(f"{'command':<10} {'wall (ms)':>10} {'imports (ms)':>13}  heavy modules loaded")
+        for label, args in commands.items():
+            runs = [run(args) for _ in range(repeat)]
+            wall = median(r["wall"] for r in runs) * 1e3
+            imports = median(r["imports"] for r in runs) * 1e3
+            loaded = [m for m in HEAVY_MODULES if m in runs[0]["modules"]]
+            print(f"{label:<10} {wall:>10.1f} {imports:>13.1f}  {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
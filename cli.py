@@ -1,8 +1,9 @@
-from flight import FlightDataHistorical, TidyHistorical
 from loguru import logger
 from pathlib import Path
 import typer
 
+# The flight package is imported inside each command so that `--help` and the
+# commands that do not call the API skip pandas, requests and the API key.
 
 app = typer.Typer(
     name="flight-data-processor",
@@ -36,6 +37,8 @@ def batch(
     """
     Download batch data for historical fligth date
     """
+    from flight import FlightDataHistorical
+
     try:
         FlightDataHistorical.save_data_range(
               date_start = date_from, 
@@ -71,6 +74,8 @@ def update(
     """
     Download flight data from today to the last day stored
     """
+    from flight import FlightDataHistorical
+
     try:
         FlightDataHistorical.update(path=path, airport_code=airport_code)
         logger.info(
@@ -102,6 +107,8 @@ def process(
     This command reads flight data from CSV files in the specified directory,
     cleans and standardizes the data, and outputs the processed data to a file.
     """
+    from flight import TidyHistorical
+
     try:
         # Process the data
         df = TidyHistorical.tidy(path=str(input_path))
@@ -0,0 +1,18 @@
+{#
+    Publish a new data version for the query service, which copies the gold
+    tables and drops its cached results when the version changes.
+
+    Only `run` and `build` change the gold layer, and a version is only
+    published when every node succeeded, so a half-built gold layer is never
+    snapshotted.
+#}
+{% macro publish_version(version_file) %}
+    {% if flags.WHICH in ('run', 'build') %}
+        {% set failed = results | selectattr('status', 'in', ['error', 'fail', 'skipped']) | list %}
+        {% if failed | length == 0 %}
+            COPY (SELECT epoch_ns(now()) AS version) TO '{{ version_file }}' (FORMAT csv, HEADER false)
+        {% else %}
+            {{ log("Data version not published, " ~ failed | length ~ " nodes did not succeed", info=true) }}
+        {% endif %}
+    {% endif %}
+{% endmacro %}
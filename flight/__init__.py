@@ -1,2 +1,36 @@
-from .api import FlightDataHistorical, FlightDataRealTime
-from .tidy import TidyHistorical
+"""
+Flight data package.
+
+The public classes are loaded on first access so that importing the package,
+or running a CLI command that does not need them, does not pay for pandas,
+requests or the API credentials.
+"""
+
+from importlib import import_module
+from typing import Any
+
+__all__ = [
+    "FlightDataHistorical",
+    "FlightDataRealTime",
+    "GoldQueryService",
+    "TidyHistorical",
+]
+
+_modules = {
+    "FlightDataHistorical": ".api",
+    "FlightDataRealTime": ".api",
+    "GoldQueryService": ".analytics",
+    "TidyHistorical": ".tidy",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_modules[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,470 @@
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+from contextlib import contextmanager
+from collections import OrderedDict
+from datetime import date
+from loguru import logger
+from hashlib import md5
+import threading
+import tempfile
+import duckdb
+import shutil
+import queue
+import os
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when a connection is requested from a pool that is being closed."""
+
+
+class SnapshotUnavailableError(RuntimeError):
+    """Raised when a query arrives before the first snapshot has been copied."""
+
+
+class ConnectionPool:
+    """
+    Pool of read-only DuckDB connections to a single database file.
+
+    DuckDB runs queries from different cursors of the same database in
+    parallel, so the pool opens the file once and hands out one cursor per
+    concurrent query. Closing the pool waits for the queries in flight.
+    """
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 30.0):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.closed = False
+        self.leases = 0
+        self.condition = threading.Condition()
+        self.database = duckdb.connect(path, read_only=True)
+        self.idle: "queue.Queue[duckdb.DuckDBPyConnection]" = queue.Queue()
+        for _ in range(size):
+            con = self.database.cursor()
+            con.execute("SET TimeZone = 'UTC'")
+            self.idle.put(con)
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Borrow a connection for the duration of the context.
+
+        Raises:
+            PoolClosedError: If the pool is being closed
+            queue.Empty: If no connection is released within the timeout
+        """
+        with self.condition:
+            if self.closed:
+                raise PoolClosedError(f"Pool for {self.path} is closed")
+            self.leases += 1
+        try:
+            con = self.idle.get(timeout=self.timeout)
+            try:
+                yield con
+            finally:
+                self.idle.put(con)
+        finally:
+            with self.condition:
+                self.leases -= 1
+                self.condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Stop lending connections, wait for the ones in use and close the database.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.wait_for(lambda: self.leases == 0, timeout=self.timeout)
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+        self.database.close()
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results.
+
+    Keys include the data version, so results of an older version are never
+    returned; the cache is also cleared when a new version is published.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            if key not in self.data:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"size": len(self.data), "hits": self.hits, "misses": self.misses}
+
+
+class GoldQueryService:
+    """
+    Read-only, cached queries over the gold layer.
+
+    A DuckDB file can be opened by one writer or by several read-only
+    processes, never both, so keeping ``prod.duckdb`` open for reading would
+    block ``dbt run`` and the Dagster I/O manager for as long as the service
+    runs. Instead the service:
+    - Reads the data version that dbt publishes in ``version_file`` from its
+      ``on-run-end`` hook; the real-time asset does not feed the gold layer, so
+      its commits do not publish versions
+    - On a new version, copies the gold tables it queries (``tables``) into a
+      snapshot and serves every query from a pool of read-only connections to
+      the snapshot
+    - Caches results by data version, query and parameters, and clears the
+      cache when the snapshot is replaced
+
+    The source is still locked while those tables are copied: a writer that
+    opens the database at that moment fails (the Dagster I/O manager retries,
+    ``dbt run`` does not). Copies only follow a dbt run, so the window is short
+    and rare, but it exists.
+
+    Snapshots are copied by a background thread (``start``), so requests only
+    read the current pool and never wait for a copy. If the source is locked
+    when a new version is detected, the previous snapshot keeps being served
+    and the copy is retried on the next check.
+    """
+
+    tables: List[str] = ["status", "time"]
+
+    group_columns: Dict[str, str] = {
+        "airline": "s.airline_iata",
+        "airport": "s.airport_iata",
+        "day": "CAST(s.scheduled_time_utc AS DATE)",
+        "flight_type": "s.flight_type",
+        "status": "s.status",
+    }
+
+    def __init__(
+        self,
+        database: str,
+        version_file: str,
+        schema: str = "main_gold",
+        pool_size: int = 4,
+        cache_size: int = 256,
+        check_interval: float = 1.0,
+        snapshot_dir: Optional[str] = None,
+    ):
+        self.database = database
+        self.version_file = version_file
+        self.schema = schema
+        self.pool_size = pool_size
+        self.cache = QueryCache(maxsize=cache_size)
+        self.check_interval = check_interval
+        self.owns_snapshot_dir = snapshot_dir is None
+        self.snapshot_dir = snapshot_dir or tempfile.mkdtemp(prefix="flights-snapshots-")
+        # Pool and version are swapped together so a query never mixes them
+        self.current: Optional[Tuple[ConnectionPool, str]] = None
+        self.refresh_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def read_version(self) -> str:
+        """
+        Read the data version published by dbt.
+
+        Falls back to a fixed version when dbt has not published one yet, so
+        the database is copied once and then only after the next dbt run.
+
+        Returns:
+            The current data version
+        """
+        try:
+            with open(self.version_file) as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except FileNotFoundError:
+            pass
+        return "initial"
+
+    def make_snapshot(self, version: str) -> str:
+        """
+        Copy the gold tables into a new snapshot file.
+
+        Args:
+            version: Data version the snapshot belongs to
+
+        Returns:
+            Path of the snapshot
+        """
+        name = os.path.splitext(os.path.basename(self.database))[0]
+        digest = md5(version.encode("utf-8")).hexdigest()[:12]
+        path = os.path.join(self.snapshot_dir, f"{name}_{digest}.duckdb")
+        if os.path.exists(path):
+            os.remove(path)
+
+        con = duckdb.connect(path)
+        try:
+            con.execute(f'CREATE SCHEMA "{self.schema}"')
+            con.execute(f"ATTACH '{self.database}' AS source (READ_ONLY)")
+            try:
+                for table in self.tables:
+                    con.execute(
+                        f'CREATE TABLE "{self.schema}"."{table}" AS '
+                        f'SELECT * FROM source."{self.schema}"."{table}"'
+                    )
+            finally:
+                con.execute("DETACH source")
+        except Exception:
+            con.close()
+            os.remove(path)
+            raise
+        con.close()
+        return path
+
+    @property
+    def version(self) -> Optional[str]:
+        """Data version being served, None until the first snapshot is ready."""
+        current = self.current
+        return current[1] if current is not None else None
+
+    def refresh(self) -> str:
+        """
+        Swap to a new snapshot when dbt has published a new version.
+
+        Returns:
+            The data version being served
+
+        Raises:
+            duckdb.IOException: If the source is locked and there is no
+                previous snapshot to keep serving
+        """
+        with self.refresh_lock:
+            current = self.current
+            version = self.read_version()
+            if current is not None and version == current[1]:
+                return version
+
+            try:
+                path = self.make_snapshot(version)
+            except duckdb.IOException as e:
+                if current is None:
+                    raise
+                logger.warning(f"Database is locked, serving version {current[1]}: {e}")
+                return current[1]
+
+            self.current = (ConnectionPool(path, size=self.pool_size), version)
+            self.cache.clear()
+            logger.info(f"Serving data version {version} from {path}")
+
+            if current is not None:
+                current[0].close()
+                os.remove(current[0].path)
+            return version
+
+    def watch(self) -> None:
+        """
+        Refresh the snapshot every ``check_interval`` seconds until closed.
+        """
+        while True:
+            try:
+                self.refresh()
+                self.ready.set()
+            except Exception as e:
+                logger.warning(f"Could not refresh the snapshot of {self.database}: {e}")
+            if self.stopped.wait(self.check_interval):
+                return
+
+    def start(self, timeout: float = 30.0) -> None:
+        """
+        Start refreshing the snapshot in a background thread.
+
+        Args:
+            timeout: Seconds to wait for the first snapshot before returning
+        """
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.watch, name="snapshot-refresh", daemon=True)
+        self.thread.start()
+        if not self.ready.wait(timeout):
+            logger.warning(f"No snapshot of {self.database} after {timeout}s, still retrying")
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> Dict[str, Any]:
+        """
+        Run a query on the current snapshot, or return its cached result.
+
+        Args:
+            sql: Query with ``?`` placeholders
+            params: Values of the placeholders
+
+        Returns:
+            Dictionary with the data version, whether the result was cached
+            and the rows as dictionaries
+
+        Raises:
+            SnapshotUnavailableError: If no snapshot has been copied yet
+        """
+        for attempt in range(2):
+            current = self.current
+            if current is None:
+                raise SnapshotUnavailableError(f"No snapshot of {self.database} available yet")
+            pool, version = current
+            key = (version, sql, tuple(params))
+            rows = self.cache.get(key)
+            if rows is not None:
+                return {"version": version, "cached": True, "rows": rows}
+            try:
+                with pool.connection() as con:
+                    cursor = con.execute(sql, list(params))
+                    columns = [column[0] for column in cursor.description]
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            except PoolClosedError:
+                # The snapshot was replaced while the query was starting
+                if attempt:
+                    raise
+                continue
+            self.cache.put(key, rows)
+            return {"version": version, "cached": False, "rows": rows}
+
+    @staticmethod
+    def filters(
+        airport: Optional[str] = None,
+        airline: Optional[str] = None,
+        date_from: Optional[Union[date, str]] = None,
+        date_to: Optional[Union[date, str]] = None,
+        flight_type: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE clause over ``gold.status`` (aliased ``s``).
+
+        Args:
+            airport: Airport the data was collected for
+            airline: Airline IATA code
+            date_from: First scheduled date (included, UTC)
+            date_to: Last scheduled date (included, UTC)
+            flight_type: 'arrival' or 'departure'
+
+        Returns:
+            Tuple with the WHERE clause and its parameters
+        """
+        conditions, params = [], []
+        if airport:
+            conditions.append("s.code = ?")
+            params.append(airport.upper())
+        if airline:
+            conditions.append("s.airline_iata = ?")
+            params.append(airline.upper())
+        if date_from:
+            conditions.append("s.scheduled_time_utc >= CAST(? AS DATE)")
+            params.append(str(date_from))
+        if date_to:
+            conditions.append("s.scheduled_time_utc < CAST(? AS DATE) + 1")
+            params.append(str(date_to))
+        if flight_type:
+            conditions.append("s.flight_type = ?")
+            params.append(flight_type)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def flights(
+        self,
+        airport: Optional[str] = None,
+        airline: Optional[str] = None,
+        date_from: Optional[Union[date, str]] = None,
+        date_to: Optional[Union[date, str]] = None,
+        flight_type: Optional[str] = None,
+        limit: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        List flights, most recent first.
+        """
+        where, params = self.filters(airport, airline, date_from, date_to, flight_type)
+        sql = f"""
+            SELECT
+                s.id, s.number, s.code, s.flight_type, s.status, s.airline_iata,
+                s.airport_iata, s.is_cargo, s.scheduled_time_utc,
+                t.revised_time_utc, t.runway_time_utc
+            FROM "{self.schema}".status AS s
+            LEFT JOIN "{self.schema}".time AS t USING (id)
+            {where}
+            ORDER BY s.scheduled_time_utc DESC
+            LIMIT ?
+        """
+        return self.query(sql, [*params, int(limit)])
+
+    def delays(
+        self,
+        airport: Optional[str] = None,
+        airline: Optional[str] = None,
+        date_from: Optional[Union[date, str]] = None,
+        date_to: Optional[Union[date, str]] = None,
+        flight_type: Optional[str] = None,
+        group_by: str = "airline",
+        delay_threshold: int = 15,
+    ) -> Dict[str, Any]:
+        """
+        Delay statistics in minutes, comparing the runway (or revised) time
+        with the scheduled time.
+        """
+        if group_by not in self.group_columns:
+            raise ValueError(
+                f"Unknown group_by {group_by}, expected one of {', '.join(self.group_columns)}"
+            )
+        where, params = self.filters(airport, airline, date_from, date_to, flight_type)
+        sql = f"""
+            WITH delays AS (
+                SELECT
+                    {self.group_columns[group_by]} AS "{group_by}",
+                    date_diff(
+                        'second',
+                        s.scheduled_time_utc,
+                        coalesce(t.runway_time_utc, t.revised_time_utc)
+                    ) / 60.0 AS delay
+                FROM "{self.schema}".status AS s
+                LEFT JOIN "{self.schema}".time AS t USING (id)
+                {where}
+            )
+            SELECT
+                "{group_by}",
+                count(*) AS flights,
+                count(delay) AS flights_with_time,
+                count(*) FILTER (WHERE delay > ?) AS delayed,
+                round(avg(delay), 1) AS avg_delay_minutes,
+                round(quantile_cont(delay, 0.5), 1) AS median_delay_minutes,
+                round(quantile_cont(delay, 0.9), 1) AS p90_delay_minutes
+            FROM delays
+            GROUP BY ALL
+            ORDER BY flights DESC
+        """
+        return self.query(sql, [*params, int(delay_threshold)])
+
+    def close(self) -> None:
+        """
+        Stop the refresh thread, close the pool and remove the snapshots.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        with self.refresh_lock:
+            current, self.current = self.current, None
+            if current is not None:
+                current[0].close()
+                os.remove(current[0].path)
+        self.ready.clear()
+        if self.owns_snapshot_dir:
+            shutil.rmtree(self.snapshot_dir, ignore_errors=True)
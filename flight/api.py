@@ -7,8 +7,27 @@ import time
 import os
 
 
+class EnvVar:
+    """
+    Class attribute read from an environment variable when it is accessed.
+
+    Reading the variable lazily lets the module be imported, and the commands
+    that do not call the API run, without the credentials being set.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner) -> str:
+        try:
+            return os.environ[self.name]
+        except KeyError:
+            logger.error(f"Environment variable {self.name} is not set")
+            raise
+
+
 class FlightDataHistorical:
-    api_key: str = os.environ["API_KEY_FLIGHTS"]
+    api_key: str = EnvVar("API_KEY_FLIGHTS")
     url: str = "https://app.goflightlabs.com/historical"
 
     @classmethod
@@ -189,7 +208,7 @@ class FlightDataHistorical:
 
 
 class FlightDataRealTime:
-    api_key: str = os.environ["API_KEY_FLIGHTS"]
+    api_key: str = EnvVar("API_KEY_FLIGHTS")
     url: str = "https://app.goflightlabs.com/flights"
 
     @classmethod
@@ -0,0 +1,241 @@
+from dagster import ConfigurableIOManager, InputContext, OutputContext
+from contextlib import contextmanager
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple, Union
+from loguru import logger
+import pandas as pd
+import pyarrow as pa
+import duckdb
+import random
+import time
+
+
+class DuckDBArrowIOManager(ConfigurableIOManager):
+    """
+    Dagster I/O manager that appends pandas DataFrames to DuckDB tables.
+
+    Unlike ``DuckDBPandasIOManager``, which replaces the whole table on every
+    materialization, this manager only touches the rows of the partition being
+    written:
+    - The DataFrame is converted to an Arrow table and registered in DuckDB,
+      so the insert scans the Arrow buffers without copying them
+    - Rows of a previous materialization of the same partition are deleted and
+      the new ones inserted in a single transaction, so re-runs are idempotent
+      and other partitions are never overwritten
+    - Columns that appear in newer API responses are added to the table, and
+      columns whose values no longer fit their type are widened (integers to
+      DOUBLE when floats arrive, anything else to VARCHAR), so DuckDB never casts
+      values of a batch to a narrower type
+
+    The table is named after the asset key: ``["main_silver", "real_time_planes"]``
+    is stored in ``main_silver.real_time_planes``. The partition key is stored
+    in ``partition_column``.
+
+    DuckDB allows a single writer process per file. Partitions run in parallel
+    and only their writes need the lock, which may also be held by dbt or the
+    query service, so the connection is retried with exponential backoff and
+    random jitter (so waiting runs do not retry in lockstep) until it is
+    released.
+    """
+
+    database: str
+    partition_column: str = "partition_key"
+    connect_retries: int = 10
+    connect_backoff: float = 0.5
+    connect_max_wait: float = 10.0
+
+    integer_types: ClassVar[List[str]] = ["TINYINT", "SMALLINT", "INTEGER", "BIGINT"]
+    float_types: ClassVar[List[str]] = ["FLOAT", "DOUBLE"]
+
+    @staticmethod
+    def table_name(context: Union[InputContext, OutputContext]) -> Tuple[str, str]:
+        """
+        Build the schema and table name from the asset key.
+
+        Args:
+            context: Dagster input or output context
+
+        Returns:
+            Tuple with the schema and the table name
+        """
+        *prefix, table = context.asset_key.path
+        schema = prefix[-1] if prefix else "main"
+        return schema, table
+
+    @contextmanager
+    def connect(self, read_only: bool = False) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Open a connection to the database, waiting while another process holds the lock.
+
+        Args:
+            read_only: Whether to open the database in read-only mode
+
+        Yields:
+            An open DuckDB connection, closed on exit
+        """
+        for attempt in range(self.connect_retries):
+            try:
+                con = duckdb.connect(self.database, read_only=read_only)
+                break
+            except duckdb.IOException as e:
+                if attempt == self.connect_retries - 1:
+                    raise
+                wait = min(self.connect_backoff * 2**attempt, self.connect_max_wait)
+                wait = round(wait * random.uniform(0.5, 1.0), 2)
+                logger.warning(f"Database {self.database} is locked, retrying in {wait}s: {e}")
+                time.sleep(wait)
+        try:
+            yield con
+        finally:
+            con.close()
+
+    @staticmethod
+    def to_arrow(df: pd.DataFrame) -> pa.Table:
+        """
+        Convert a DataFrame to Arrow, dropping the columns that are entirely null.
+
+        An all-null column carries no type information: creating or widening a
+        table column from it would pick an arbitrary type (optional fields such
+        as ``alt`` or ``speed`` are often null for a quiet airport). Dropped
+        columns are stored as NULL by ``INSERT ... BY NAME`` and are created
+        when a batch has values for them.
+
+        Args:
+            df: DataFrame to convert
+
+        Returns:
+            Arrow table with the columns of the DataFrame that have values
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        return table.select(
+            [
+                name
+                for name, column in zip(table.column_names, table.columns)
+                if column.null_count < len(column)
+            ]
+        )
+
+    @classmethod
+    def widened_type(cls, table_type: str, batch_type: str) -> Optional[str]:
+        """
+        Get the type a column needs to store a batch without losing values.
+
+        Args:
+            table_type: Current type of the column in the table
+            batch_type: Type of the column in the new batch
+
+        Returns:
+            The new type of the column, or None if the current one is enough
+        """
+        numeric_types = cls.integer_types + cls.float_types
+        if table_type == batch_type or table_type == "VARCHAR":
+            return None
+        if table_type in numeric_types and batch_type in numeric_types:
+            if numeric_types.index(batch_type) <= numeric_types.index(table_type):
+                return None
+            if batch_type in cls.float_types:
+                return "DOUBLE"
+            return batch_type
+        return "VARCHAR"
+
+    @classmethod
+    def align_columns(
+        cls,
+        con: duckdb.DuckDBPyConnection,
+        schema: str,
+        table: str,
+        view: str,
+    ) -> Dict[str, str]:
+        """
+        Add the columns of the registered view the table does not have yet and
+        widen the ones whose type cannot hold the values of the view.
+
+        Args:
+            con: Open DuckDB connection
+            schema: Schema of the target table
+            table: Name of the target table
+            view: Name of the registered Arrow view
+
+        Returns:
+            Dictionary with the added or altered columns and their new type
+        """
+        existing = dict(
+            con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = ? AND table_name = ?",
+                [schema, table],
+            ).fetchall()
+        )
+        name = f'"{schema}"."{table}"'
+        changed = {}
+        for column, dtype, *_ in con.execute(f"DESCRIBE SELECT * FROM {view}").fetchall():
+            if column not in existing:
+                con.execute(f'ALTER TABLE {name} ADD COLUMN "{column}" {dtype}')
+                changed[column] = dtype
+                continue
+            widened = cls.widened_type(existing[column], dtype)
+            if widened is not None:
+                con.execute(f'ALTER TABLE {name} ALTER COLUMN "{column}" TYPE {widened}')
+                changed[column] = widened
+        return changed
+
+    def handle_output(self, context: OutputContext, obj: pd.DataFrame) -> None:
+        schema, table = self.table_name(context)
+        name = f'"{schema}"."{table}"'
+
+        if obj.empty:
+            logger.warning(f"Empty DataFrame, nothing written to {name}")
+            return
+
+        partition_key = str(context.partition_key) if context.has_partition_key else None
+        if partition_key is not None:
+            obj = obj.assign(**{self.partition_column: partition_key})
+
+        arrow = self.to_arrow(obj)
+        if arrow.num_columns == 0:
+            logger.warning(f"All columns are null, nothing written to {name}")
+            return
+        view = f"{table}_partition"
+
+        with self.connect() as con:
+            con.register(view, arrow)
+            try:
+                con.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+                con.execute(f"CREATE TABLE IF NOT EXISTS {name} AS SELECT * FROM {view} LIMIT 0")
+                changed = self.align_columns(con, schema, table, view)
+                if changed:
+                    logger.info(f"Changed columns of {name}: {changed}")
+
+                con.execute("BEGIN TRANSACTION")
+                try:
+                    if partition_key is None:
+                        con.execute(f"DELETE FROM {name}")
+                    else:
+                        con.execute(
+                            f'DELETE FROM {name} WHERE "{self.partition_column}" = ?',
+                            [partition_key],
+                        )
+                    con.execute(f"INSERT INTO {name} BY NAME SELECT * FROM {view}")
+                    con.execute("COMMIT")
+                except Exception:
+                    con.execute("ROLLBACK")
+                    raise
+            finally:
+                con.unregister(view)
+
+        logger.info(f"Appended {len(obj)} rows to {name} (partition {partition_key})")
+        context.add_output_metadata(
+            {"table": f"{schema}.{table}", "rows": len(obj), "partition": partition_key or ""}
+        )
+
+    def load_input(self, context: InputContext) -> pd.DataFrame:
+        schema, table = self.table_name(context)
+        query = f'SELECT * FROM "{schema}"."{table}"'
+        params: List[str] = []
+
+        if context.has_asset_partitions:
+            params = [str(key) for key in context.asset_partition_keys]
+            placeholders = ", ".join("?" for _ in params)
+            query += f' WHERE "{self.partition_column}" IN ({placeholders})'
+
+        with self.connect(read_only=True) as con:
+            return con.execute(query, params).df()
@@ -0,0 +1,146 @@
+"""
+Read-only Query API over the Gold Layer
+
+This module exposes the gold tables built by dbt through a small HTTP API, so
+dashboards and consumers do not keep the DuckDB file open and locked while they
+query it.
+
+Components:
+-----------
+- GoldQueryService: Serves queries from a snapshot of the database through a
+  pool of read-only connections and caches the results by data version
+- /flights: Flights by airport, airline, date range and flight type
+- /delays: Delay statistics grouped by airline, airport, day, flight type or status
+- /health: Data version being served and cache statistics
+
+Configuration:
+-------------
+DB_PATH: Path to the DuckDB database file ('/app/data/db/prod.duckdb')
+VERSION_PATH: File where dbt publishes a new data version at the end of each run
+  ('/app/data/db/prod.version')
+QUERY_POOL_SIZE: Read-only connections in the pool (default 4)
+QUERY_CACHE_SIZE: Query results kept in the cache (default 256)
+
+Usage:
+------
+Run the API with:
+    $ uvicorn query_api:app --host 0.0.0.0 --port 8000
+
+and query it with:
+    $ curl "localhost:8000/flights?airport=BOG&date_from=2025-03-01&airline=AV"
+    $ curl "localhost:8000/delays?airport=BOG&group_by=day"
+
+Notes:
+------
+- Results are cached until dbt publishes a new version, repeated queries are
+  answered from memory
+- New versions are copied by a background thread, requests never wait for a copy
+- The database is only locked while the gold tables of a new version are copied
+  into a snapshot; a `dbt run` starting in that window fails to open it
+"""
+
+from fastapi import FastAPI, HTTPException, Query
+from flight.analytics import GoldQueryService, PoolClosedError, SnapshotUnavailableError
+from typing import Any, Dict, Literal, Optional
+from contextlib import asynccontextmanager
+from datetime import date
+import queue
+import os
+
+DB_PATH = "/app/data/db/prod.duckdb"
+VERSION_PATH = "/app/data/db/prod.version"
+POOL_SIZE = int(os.environ.get("QUERY_POOL_SIZE", "4"))
+CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE", "256"))
+
+FlightType = Literal["arrival", "departure"]
+GroupBy = Literal["airline", "airport", "day", "flight_type", "status"]
+
+service = GoldQueryService(
+    database=DB_PATH,
+    version_file=VERSION_PATH,
+    pool_size=POOL_SIZE,
+    cache_size=CACHE_SIZE,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    service.start()
+    yield
+    service.close()
+
+
+app = FastAPI(
+    title="flight-data-api",
+    description="Read-only queries over the gold layer",
+    lifespan=lifespan,
+)
+
+
+def run(method, **kwargs) -> Dict[str, Any]:
+    try:
+        return method(**kwargs)
+    except (SnapshotUnavailableError, PoolClosedError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except queue.Empty:
+        raise HTTPException(
+            status_code=503, detail="No connection available, the service is busy"
+        )
+
+
+@app.get("/flights")
+def flights(
+    airport: Optional[str] = Query(None, description="The airport code (e.g., 'BOG')"),
+    airline: Optional[str] = Query(None, description="The airline IATA code (e.g., 'AV')"),
+    date_from: Optional[date] = Query(None, description="First scheduled date (included)"),
+    date_to: Optional[date] = Query(None, description="Last scheduled date (included)"),
+    flight_type: Optional[FlightType] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+) -> Dict[str, Any]:
+    """
+    List flights, most recent first.
+    """
+    return run(
+        service.flights,
+        airport=airport,
+        airline=airline,
+        date_from=date_from,
+        date_to=date_to,
+        flight_type=flight_type,
+        limit=limit,
+    )
+
+
+@app.get("/delays")
+def delays(
+    airport: Optional[str] = Query(None, description="The airport code (e.g., 'BOG')"),
+    airline: Optional[str] = Query(None, description="The airline IATA code (e.g., 'AV')"),
+    date_from: Optional[date] = Query(None, description="First scheduled date (included)"),
+    date_to: Optional[date] = Query(None, description="Last scheduled date (included)"),
+    flight_type: Optional[FlightType] = None,
+    group_by: GroupBy = "airline",
+    delay_threshold: int = Query(15, ge=0, description="Minutes to count a flight as delayed"),
+) -> Dict[str, Any]:
+    """
+    Delay statistics in minutes.
+    """
+    return run(
+        service.delays,
+        airport=airport,
+        airline=airline,
+        date_from=date_from,
+        date_to=date_to,
+        flight_type=flight_type,
+        group_by=group_by,
+        delay_threshold=delay_threshold,
+    )
+
+
+@app.get("/health")
+def health() -> Dict[str, Any]:
+    """
+    Data version being served and cache statistics.
+    """
+    if service.version is None:
+        raise HTTPException(status_code=503, detail="No snapshot available yet")
+    return {"version": service.version, "cache": service.cache.stats()}
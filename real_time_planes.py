@@ -2,17 +2,19 @@
 Real-time Flight Data Processing Pipeline
 
 This module defines a Dagster pipeline that fetches real-time flight data
-from Bogota airport (BOG) and stores it in a DuckDB database.
+for a set of airports and stores it in a DuckDB database.
 
 Components:
 -----------
 - FlightDataRealTime: External API client class that retrieves flight data
-- DuckDBPandasIOManager: Dagster I/O manager for storing pandas DataFrames in DuckDB
-- real_time_planes: Asset that fetches and returns flight data as a DataFrame
+- DuckDBArrowIOManager: Dagster I/O manager that appends each partition to DuckDB
+  through Arrow instead of replacing the whole table
+- real_time_planes: Partitioned asset that fetches and returns flight data as a DataFrame
 
 Configuration:
 -------------
 DB_PATH: Path to the DuckDB database file used for storage ('/app/data/db/prod.duckdb')
+AIRPORTS: Comma-separated airport codes, one static partition each (default 'BOG')
 
 Usage:
 ------
@@ -20,30 +22,59 @@ Run the pipeline with:
     $ dagster dev -f <filename>.py
     $ dagit  -f <filename>.py
 
+Materialize several airports at once by launching a backfill over their partitions.
+Each partition is its own run, so the API calls run in parallel. DuckDB allows a
+single writer per file, so only the writes are serialized: the I/O manager retries
+the connection while another run holds the lock.
+
 Or deploy as part of a larger Dagster instance.
 
 Notes:
 ------
 - The asset is defined with key_prefix="main_silver", indicating this is a silver-layer
   asset in the medallion architecture
-- Real-time flight data is fetched specifically for Bogota airport (BOG)
-- Data is stored automatically in the DuckDB database through the I/O manager
+- Each materialization replaces the rows of its airport with the current flights.
+  The API only serves current data, so there are no time partitions: backfilling a
+  past window would store today's flights under it
 """
 
-from dagster_duckdb_pandas import DuckDBPandasIOManager
+from dagster import (
+    AssetExecutionContext,
+    Definitions,
+    StaticPartitionsDefinition,
+    asset,
+    define_asset_job,
+)
+from flight.duckdb_io import DuckDBArrowIOManager
 from flight.api import FlightDataRealTime
-from dagster import asset, Definitions
 from pandas import DataFrame
+import os
 
 DB_PATH = "/app/data/db/prod.duckdb"
+AIRPORTS = [
+    code.strip().upper()
+    for code in os.environ.get("AIRPORTS", "BOG").split(",")
+    if code.strip()
+]
+
+partitions_def = StaticPartitionsDefinition(AIRPORTS)
 
 
-@asset(key_prefix=["main_silver"])
-def real_time_planes() -> DataFrame:
-    return FlightDataRealTime.get_data("BOG")
+@asset(key_prefix=["main_silver"], partitions_def=partitions_def)
+def real_time_planes(context: AssetExecutionContext) -> DataFrame:
+    context.log.info(f"Fetching real-time flights for {context.partition_key}")
+    return FlightDataRealTime.get_data(context.partition_key)
+
+
+real_time_planes_job = define_asset_job(
+    name="real_time_planes_job",
+    selection=[real_time_planes],
+    partitions_def=partitions_def,
+)
 
 
 defs = Definitions(
     assets=[real_time_planes],
-    resources={"io_manager": DuckDBPandasIOManager(database=DB_PATH)},
+    jobs=[real_time_planes_job],
+    resources={"io_manager": DuckDBArrowIOManager(database=DB_PATH)},
 )
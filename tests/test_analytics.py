@@ -0,0 +1,190 @@
+from flight.analytics import GoldQueryService, SnapshotUnavailableError
+import subprocess
+import textwrap
+import duckdb
+import pytest
+import sys
+import os
+
+
+def write_gold(path, airlines):
+    con = duckdb.connect(path)
+    try:
+        con.execute("CREATE SCHEMA IF NOT EXISTS main_gold")
+        con.execute(
+            """
+            CREATE OR REPLACE TABLE main_gold.status AS
+            SELECT
+                md5(i::VARCHAR) AS id,
+                'AV' || i AS number,
+                'BOG' AS code,
+                'departure' AS flight_type,
+                'Departed' AS status,
+                airline AS airline_iata,
+                'MDE' AS airport_iata,
+                false AS is_cargo,
+                TIMESTAMPTZ '2025-03-01 10:00:00+00' + to_hours(i) AS scheduled_time_utc
+            FROM (SELECT unnest(?) AS airline, generate_subscripts(?, 1) AS i)
+            """,
+            [airlines, airlines],
+        )
+        con.execute(
+            """
+            CREATE OR REPLACE TABLE main_gold.time AS
+            SELECT
+                id,
+                scheduled_time_utc,
+                scheduled_time_utc + to_minutes(10) AS revised_time_utc,
+                scheduled_time_utc + to_minutes(30) AS runway_time_utc
+            FROM main_gold.status
+            """
+        )
+    finally:
+        con.close()
+
+
+@pytest.fixture
+def gold(tmp_path):
+    database = str(tmp_path / "prod.duckdb")
+    version_file = str(tmp_path / "prod.version")
+    write_gold(database, ["AV", "LA"])
+    service = GoldQueryService(
+        database=database,
+        version_file=version_file,
+        snapshot_dir=str(tmp_path / "snapshots"),
+    )
+    os.makedirs(service.snapshot_dir)
+    yield service
+    service.close()
+
+
+def publish(service, version):
+    with open(service.version_file, "w") as f:
+        f.write(version)
+
+
+@pytest.fixture
+def locked(gold):
+    """Hold the write lock on the source database from another process."""
+    script = textwrap.dedent(
+        f"""
+        import duckdb, sys
+        con = duckdb.connect({gold.database!r})
+        print("locked", flush=True)
+        sys.stdin.read()
+        """
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout.readline().strip() == "locked"
+    yield
+    process.communicate()
+
+
+def test_query_before_snapshot_is_unavailable(gold):
+    with pytest.raises(SnapshotUnavailableError):
+        gold.flights()
+
+
+def test_flights_filters_and_caches(gold):
+    publish(gold, "v1")
+    assert gold.refresh() == "v1"
+
+    first = gold.flights(airport="bog", airline="av")
+    second = gold.flights(airport="bog", airline="av")
+
+    assert [row["airline_iata"] for row in first["rows"]] == ["AV"]
+    assert not first["cached"]
+    assert second["cached"]
+    assert second["rows"] == first["rows"]
+
+
+def test_delays(gold):
+    publish(gold, "v1")
+    gold.refresh()
+
+    rows = gold.delays(group_by="airline")["rows"]
+
+    assert {row["airline"] for row in rows} == {"AV", "LA"}
+    assert all(row["avg_delay_minutes"] == 30.0 for row in rows)
+    with pytest.raises(ValueError):
+        gold.delays(group_by="unknown")
+
+
+def test_new_version_clears_cache(gold):
+    publish(gold, "v1")
+    gold.refresh()
+    gold.flights()
+    assert gold.cache.stats()["size"] == 1
+
+    write_gold(gold.database, ["AV"])
+    publish(gold, "v2")
+    assert gold.refresh() == "v2"
+
+    assert gold.cache.stats()["size"] == 0
+    result = gold.flights()
+    assert not result["cached"]
+    assert result["version"] == "v2"
+    assert [row["airline_iata"] for row in result["rows"]] == ["AV"]
+
+
+def test_same_version_keeps_snapshot(gold):
+    publish(gold, "v1")
+    gold.refresh()
+    pool = gold.current[0]
+    gold.flights()
+
+    assert gold.refresh() == "v1"
+    assert gold.current[0] is pool
+    assert gold.flights()["cached"]
+
+
+def test_serves_old_version_while_source_is_locked(gold, request):
+    publish(gold, "v1")
+    gold.refresh()
+    expected = gold.flights()["rows"]
+
+    publish(gold, "v2")
+    request.getfixturevalue("locked")
+
+    assert gold.refresh() == "v1"
+    result = gold.flights()
+    assert result["version"] == "v1"
+    assert result["rows"] == expected
+
+
+def test_locked_source_without_snapshot_raises(gold, locked):
+    with pytest.raises(duckdb.IOException):
+        gold.refresh()
+
+
+def test_snapshot_does_not_keep_source_locked(gold):
+    publish(gold, "v1")
+    gold.refresh()
+
+    # A writer can open the source while the snapshot is being served
+    write_gold(gold.database, ["LA"])
+    assert len(gold.flights()["rows"]) == 2
+
+
+def test_background_refresh_and_close(tmp_path):
+    database = str(tmp_path / "prod.duckdb")
+    write_gold(database, ["AV"])
+    service = GoldQueryService(
+        database=database,
+        version_file=str(tmp_path / "prod.version"),
+        check_interval=0.05,
+    )
+    service.start(timeout=10)
+    try:
+        assert service.version == "initial"
+        assert len(service.flights()["rows"]) == 1
+    finally:
+        service.close()
+
+    assert service.version is None
+    assert not os.path.exists(service.snapshot_dir)
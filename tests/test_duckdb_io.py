@@ -0,0 +1,143 @@
+from flight.duckdb_io import DuckDBArrowIOManager
+from types import SimpleNamespace
+from dagster import AssetKey
+import multiprocessing
+import pandas as pd
+import duckdb
+import pytest
+
+
+@pytest.fixture
+def io_manager(tmp_path):
+    return DuckDBArrowIOManager(database=str(tmp_path / "test.duckdb"))
+
+
+def output_context(partition_key=None):
+    return SimpleNamespace(
+        asset_key=AssetKey(["main_silver", "real_time_planes"]),
+        has_partition_key=partition_key is not None,
+        partition_key=partition_key,
+        add_output_metadata=lambda metadata: None,
+    )
+
+
+def read_table(io_manager):
+    con = duckdb.connect(io_manager.database, read_only=True)
+    try:
+        df = con.execute(
+            "SELECT * FROM main_silver.real_time_planes ORDER BY partition_key, code"
+        ).df()
+        types = {
+            column: dtype
+            for column, dtype, *_ in con.execute("DESCRIBE main_silver.real_time_planes").fetchall()
+        }
+    finally:
+        con.close()
+    return df, types
+
+
+def test_replaces_only_its_partition(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG", "BOG"]}))
+    io_manager.handle_output(output_context("MAD"), pd.DataFrame({"code": ["MAD"]}))
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"]}))
+
+    df, _ = read_table(io_manager)
+    assert df["partition_key"].tolist() == ["BOG", "MAD"]
+
+
+def test_empty_dataframe_keeps_partition(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"]}))
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame())
+
+    df, _ = read_table(io_manager)
+    assert df["code"].tolist() == ["BOG"]
+
+
+def test_adds_new_columns(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"]}))
+    io_manager.handle_output(
+        output_context("MAD"), pd.DataFrame({"code": ["MAD"], "gate": ["A1"]})
+    )
+
+    df, _ = read_table(io_manager)
+    assert df["gate"].isna().tolist() == [True, False]
+    assert df["gate"].iloc[1] == "A1"
+
+
+def test_widens_integer_columns_to_double(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"], "alt": [1]}))
+    io_manager.handle_output(output_context("MAD"), pd.DataFrame({"code": ["MAD"], "alt": [3.5]}))
+
+    df, types = read_table(io_manager)
+    assert types["alt"] == "DOUBLE"
+    assert df["alt"].tolist() == [1.0, 3.5]
+
+
+def test_null_batch_keeps_column_type(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"], "alt": [1.5]}))
+    io_manager.handle_output(output_context("MAD"), pd.DataFrame({"code": ["MAD"], "alt": [None]}))
+
+    df, types = read_table(io_manager)
+    assert types["alt"] == "DOUBLE"
+    assert df["alt"].iloc[0] == 1.5
+    assert pd.isna(df["alt"].iloc[1])
+
+
+def test_null_first_batch_does_not_create_column(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"], "alt": [None]}))
+    _, types = read_table(io_manager)
+    assert "alt" not in types
+
+    io_manager.handle_output(output_context("MAD"), pd.DataFrame({"code": ["MAD"], "alt": [2]}))
+    df, types = read_table(io_manager)
+    assert types["alt"] == "BIGINT"
+    assert pd.isna(df["alt"].iloc[0])
+    assert df["alt"].iloc[1] == 2
+
+
+def test_widens_incompatible_columns_to_varchar(io_manager):
+    io_manager.handle_output(output_context("BOG"), pd.DataFrame({"code": ["BOG"], "flag": [True]}))
+    io_manager.handle_output(output_context("MAD"), pd.DataFrame({"code": ["MAD"], "flag": ["x"]}))
+
+    df, types = read_table(io_manager)
+    assert types["flag"] == "VARCHAR"
+    assert df["flag"].tolist() == ["true", "x"]
+
+
+@pytest.mark.parametrize(
+    "table_type, batch_type, expected",
+    [
+        ("BIGINT", "BIGINT", None),
+        ("DOUBLE", "BIGINT", None),
+        ("INTEGER", "BIGINT", "BIGINT"),
+        ("BIGINT", "DOUBLE", "DOUBLE"),
+        ("VARCHAR", "DOUBLE", None),
+        ("BOOLEAN", "VARCHAR", "VARCHAR"),
+    ],
+)
+def test_widened_type(table_type, batch_type, expected):
+    assert DuckDBArrowIOManager.widened_type(table_type, batch_type) == expected
+
+
+def write_partition(database, code):
+    io_manager = DuckDBArrowIOManager(database=database, connect_backoff=0.05)
+    io_manager.handle_output(
+        output_context(code), pd.DataFrame({"code": [code] * 1000, "alt": range(1000)})
+    )
+
+
+def test_parallel_partitions_wait_for_the_lock(io_manager):
+    codes = ["BOG", "MAD", "JFK", "LIM", "MEX", "SCL"]
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=write_partition, args=(io_manager.database, code))
+        for code in codes
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * len(codes)
+    df, _ = read_table(io_manager)
+    assert df.groupby("partition_key").size().to_dict() == {code: 1000 for code in codes}